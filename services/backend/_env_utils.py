@@ -0,0 +1,31 @@
+"""
+Shared .env helpers for the diagnostic scripts
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict
+
+@lru_cache(maxsize=None)
+def load_env(path: str = ".env") -> Dict[str, str]:
+    """Parse a .env file once into a dict of KEY -> value; missing files give {}."""
+    env_path = Path(path)
+    if not env_path.is_file():
+        return {}
+    
+    env = {}
+    for line in env_path.read_text().splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        env[key.strip()] = value.strip().strip('"').strip("'")
+    return env
+
+# Prisma sizes its pool as num_cpus * 2 + 1 with a 5s pool_timeout unless the
+# URL says otherwise; concurrent diagnostics want explicit, roomier settings
+RECOMMENDED_POOL_PARAMS = "connection_limit=10&pool_timeout=30"
+
+def missing_pool_settings(database_url: str) -> bool:
+    """Return True when a DATABASE_URL leaves Prisma's connection_limit at its default."""
+    return "connection_limit=" not in database_url
@@ -6,6 +6,7 @@ Compares Orion 10-K data against LLM organized requirements to identify gaps and
 import os
 import json
 import uuid
+import orjson
 import asyncio
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
@@ -314,7 +315,7 @@ Return ONLY valid JSON with tasks array.
             "notes_to_financials": orion_data.get("notes_to_financials", {})
         }
         
-        return json.dumps(key_sections, indent=2)
+        return orjson.dumps(key_sections, option=orjson.OPT_INDENT_2).decode()
 
     def _prepare_requirements_data(self, requirements: List[Dict[str, Any]]) -> str:
         """Prepare compliance requirements for LLM analysis."""
@@ -332,7 +333,7 @@ Return ONLY valid JSON with tasks array.
             }
             formatted_requirements.append(formatted_req)
         
-        return json.dumps(formatted_requirements, indent=2)
+        return orjson.dumps(formatted_requirements, option=orjson.OPT_INDENT_2).decode()
 
     def _parse_analysis_response(self, llm_output: str) -> Dict[str, Any]:
         """Parse gap analysis response from LLM."""
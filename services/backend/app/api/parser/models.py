@@ -48,6 +48,9 @@ class LegalEntity(BaseModel):
     confidence: float = Field(..., ge=0.0, le=1.0, description="Entity confidence score")
     start_pos: int = Field(..., description="Start position in text")
     end_pos: int = Field(..., description="End position in text")
+    
+    class Config:
+        frozen = True  # Entities are never mutated after extraction
 
 
 class ComplianceRule(BaseModel):
@@ -5,6 +5,7 @@ Provides significant performance improvements for large documents.
 
 import torch
 import re
+import numpy as np
 from typing import List, Optional, Dict, Any
 from .models import LegalEntity, ComplianceRule, EnhancedComplianceRule
 
@@ -289,9 +290,8 @@ class OptimizedLegalBERTEngine:
         entities = self.extract_entities(text)
         
         # Calculate BERT confidence
-        bert_confidence = 0.5
-        if entities:
-            bert_confidence = sum(entity.confidence for entity in entities) / len(entities)
+        confidences = np.fromiter((entity.confidence for entity in entities), dtype=np.float64, count=len(entities))
+        bert_confidence = float(confidences.mean()) if confidences.size else 0.5
         
         # Create enhanced rule
         enhanced_rule = EnhancedComplianceRule(
@@ -36,6 +36,12 @@ class LegalParserEngine:
             ]
         }
         
+        # One compiled alternation per rule type, checked in priority order
+        self._rule_type_regexes = [
+            (rule_type, re.compile("|".join(f"(?:{pattern})" for pattern in patterns)))
+            for rule_type, patterns in self.rule_patterns.items()
+        ]
+        
         self.deadline_patterns = [
             r"within (\d+)\s*days?",
             r"(\d+)\s*days? after",
@@ -49,33 +55,42 @@ class LegalParserEngine:
             r"penalty.*\$([\d,]+)",
             r"up to \$([\d,]+)"
         ]
+        
+        # Action verbs in priority order; the lookahead finds overlapping hits in one scan
+        self.action_verbs = ["file", "submit", "disclose", "report", "notify", "maintain"]
+        self._action_regex = re.compile(f"(?=({'|'.join(self.action_verbs)}))")
     
     def extract_rules(self, document: LegalDocument) -> List[ComplianceRule]:
         """Extract compliance rules from a legal document."""
         rules = []
-        content = document.content.lower()
         
         # Split content into sentences for better processing
         sentences = self._split_into_sentences(document.content)
         
         for i, sentence in enumerate(sentences):
+            # Only the highest-priority rule type survives deduplication,
+            # so build a single rule per sentence
             sentence_lower = sentence.lower()
-            
-            # Check for different rule types
-            for rule_type, patterns in self.rule_patterns.items():
-                for pattern in patterns:
-                    if re.search(pattern, sentence_lower):
-                        rule = self._create_rule_from_sentence(
-                            sentence, rule_type, document, i
-                        )
-                        if rule:
-                            rules.append(rule)
+            rule_type = self.classify_rule_type(sentence_lower)
+            if rule_type:
+                rule = self._create_rule_from_sentence(
+                    sentence, rule_type, document, i, sentence_lower
+                )
+                if rule:
+                    rules.append(rule)
         
         # Remove duplicates and merge similar rules
         rules = self._deduplicate_rules(rules)
         
         return rules
     
+    def classify_rule_type(self, sentence_lower: str) -> Optional[str]:
+        """Return the highest-priority rule type matching a lowercased sentence."""
+        for rule_type, regex in self._rule_type_regexes:
+            if regex.search(sentence_lower):
+                return rule_type
+        return None
+    
     def _split_into_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
         # Simple sentence splitting - can be enhanced with NLP libraries
@@ -83,22 +98,27 @@ class LegalParserEngine:
         return [s.strip() for s in sentences if s.strip()]
     
     def _create_rule_from_sentence(self, sentence: str, rule_type: str, 
-                                  document: LegalDocument, sentence_index: int) -> Optional[ComplianceRule]:
+                                  document: LegalDocument, sentence_index: int,
+                                  sentence_lower: Optional[str] = None) -> Optional[ComplianceRule]:
         """Create a compliance rule from a sentence."""
         try:
+            # Lowercase once; every keyword helper works on this copy
+            if sentence_lower is None:
+                sentence_lower = sentence.lower()
+            
             # Extract deadline information
-            deadline = self._extract_deadline(sentence)
+            deadline = self._extract_deadline(sentence_lower)
             
             # Extract penalty information
-            penalties = self._extract_penalties(sentence)
+            penalties = self._extract_penalties(sentence_lower)
             
             # Create requirements
             requirements = [Requirement(
-                action=self._extract_action(sentence),
+                action=self._extract_action(sentence_lower),
                 deadline=deadline,
-                entities=self._extract_entities(sentence),
-                thresholds=self._extract_thresholds(sentence),
-                conditions=self._extract_conditions(sentence)
+                entities=self._extract_entities(sentence_lower),
+                thresholds=self._extract_thresholds(sentence_lower),
+                conditions=self._extract_conditions(sentence_lower)
             )]
             
             # Create penalty info if found
@@ -114,7 +134,7 @@ class LegalParserEngine:
             rule_id = f"RULE-{document.id[:8]}-{sentence_index:03d}"
             
             # Calculate confidence score (simple heuristic)
-            confidence = self._calculate_confidence(sentence, rule_type)
+            confidence = self._calculate_confidence(sentence_lower, rule_type)
             
             return ComplianceRule(
                 rule_id=rule_id,
@@ -123,7 +143,7 @@ class LegalParserEngine:
                 description=sentence.strip(),
                 requirements=requirements,
                 penalties=penalty_info,
-                exceptions=self._extract_exceptions(sentence),
+                exceptions=self._extract_exceptions(sentence_lower),
                 source_document=document.filename,
                 confidence_score=confidence
             )
@@ -132,40 +152,39 @@ class LegalParserEngine:
             print(f"Error creating rule from sentence: {e}")
             return None
     
-    def _extract_deadline(self, sentence: str) -> Optional[str]:
-        """Extract deadline information from sentence."""
+    def _extract_deadline(self, sentence_lower: str) -> Optional[str]:
+        """Extract deadline information from a lowercased sentence."""
         for pattern in self.deadline_patterns:
-            match = re.search(pattern, sentence.lower())
+            match = re.search(pattern, sentence_lower)
             if match:
                 days = match.group(1)
                 return f"{days} days"
         return None
     
-    def _extract_penalties(self, sentence: str) -> Dict[str, str]:
-        """Extract penalty information from sentence."""
+    def _extract_penalties(self, sentence_lower: str) -> Dict[str, str]:
+        """Extract penalty information from a lowercased sentence."""
         penalties = {}
         for pattern in self.penalty_patterns:
-            match = re.search(pattern, sentence.lower())
+            match = re.search(pattern, sentence_lower)
             if match:
                 amount = match.group(1)
-                if "per day" in sentence.lower():
+                if "per day" in sentence_lower:
                     penalties["late_filing"] = f"${amount} per day"
-                elif "material" in sentence.lower():
+                elif "material" in sentence_lower:
                     penalties["material_misstatement"] = f"${amount}"
                 else:
                     penalties["other"] = f"${amount}"
         return penalties
     
-    def _extract_action(self, sentence: str) -> str:
-        """Extract the main action from sentence."""
+    def _extract_action(self, sentence_lower: str) -> str:
+        """Extract the main action from a lowercased sentence."""
         # Simple extraction - can be enhanced with NLP
-        action_verbs = ["file", "submit", "disclose", "report", "notify", "maintain"]
-        for verb in action_verbs:
-            if verb in sentence.lower():
-                return verb
-        return "comply"
+        found = set(self._action_regex.findall(sentence_lower))
+        if not found:
+            return "comply"
+        return next(verb for verb in self.action_verbs if verb in found)
     
-    def _extract_entities(self, sentence: str) -> List[str]:
+    def _extract_entities(self, sentence_lower: str) -> List[str]:
         """Extract entities subject to the rule."""
         entities = []
         entity_patterns = [
@@ -177,28 +196,28 @@ class LegalParserEngine:
         ]
         
         for pattern in entity_patterns:
-            if re.search(pattern, sentence.lower()):
+            if re.search(pattern, sentence_lower):
                 entities.append(pattern.replace("?", "").replace("(", "").replace(")", ""))
         
         return entities if entities else ["covered entities"]
     
-    def _extract_thresholds(self, sentence: str) -> Optional[Dict[str, Any]]:
+    def _extract_thresholds(self, sentence_lower: str) -> Optional[Dict[str, Any]]:
         """Extract monetary or other thresholds."""
         thresholds = {}
         
         # Look for monetary amounts
         money_pattern = r"\$([\d,]+(?:\.\d{2})?)"
-        money_matches = re.findall(money_pattern, sentence)
+        money_matches = re.findall(money_pattern, sentence_lower)
         if money_matches:
             thresholds["monetary"] = [f"${amount}" for amount in money_matches]
         
         # Look for revenue thresholds
-        if "revenue" in sentence.lower():
+        if "revenue" in sentence_lower:
             thresholds["revenue"] = "specified threshold"
         
         return thresholds if thresholds else None
     
-    def _extract_conditions(self, sentence: str) -> List[str]:
+    def _extract_conditions(self, sentence_lower: str) -> List[str]:
         """Extract conditions for the requirement."""
         conditions = []
         
@@ -211,12 +230,12 @@ class LegalParserEngine:
         ]
         
         for pattern in conditional_patterns:
-            matches = re.findall(pattern, sentence.lower())
+            matches = re.findall(pattern, sentence_lower)
             conditions.extend(matches)
         
         return conditions
     
-    def _extract_exceptions(self, sentence: str) -> List[str]:
+    def _extract_exceptions(self, sentence_lower: str) -> List[str]:
         """Extract exceptions from the rule."""
         exceptions = []
         
@@ -228,23 +247,23 @@ class LegalParserEngine:
         ]
         
         for pattern in exception_patterns:
-            matches = re.findall(pattern, sentence.lower())
+            matches = re.findall(pattern, sentence_lower)
             exceptions.extend(matches)
         
         return exceptions
     
-    def _calculate_confidence(self, sentence: str, rule_type: str) -> float:
+    def _calculate_confidence(self, sentence_lower: str, rule_type: str) -> float:
         """Calculate confidence score for the rule."""
         base_confidence = 0.5
         
         # Increase confidence based on specific indicators
-        if any(word in sentence.lower() for word in ["must", "required", "shall"]):
+        if any(word in sentence_lower for word in ["must", "required", "shall"]):
             base_confidence += 0.2
         
-        if any(word in sentence.lower() for word in ["penalty", "fine", "violation"]):
+        if any(word in sentence_lower for word in ["penalty", "fine", "violation"]):
             base_confidence += 0.1
         
-        if any(word in sentence.lower() for word in ["days", "deadline", "filing"]):
+        if any(word in sentence_lower for word in ["days", "deadline", "filing"]):
             base_confidence += 0.1
         
         return min(base_confidence, 1.0)
@@ -1,8 +1,10 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
 from fastapi.responses import JSONResponse
 from typing import List, Optional
+from collections import Counter
 import time
 import os
+import re
 
 from .models import (
     DocumentUploadResponse, 
@@ -228,8 +230,11 @@ async def search_rules(
         rules = list(rules_storage.values())
         
         # Apply filters
+        # Compile each text filter once and match case-insensitively, rather
+        # than lowercasing every rule's text per request
         if query:
-            rules = [rule for rule in rules if query.lower() in rule.description.lower()]
+            query_regex = re.compile(re.escape(query), re.IGNORECASE)
+            rules = [rule for rule in rules if query_regex.search(rule.description) is not None]
         
         if rule_type:
             rules = [rule for rule in rules if rule.rule_type.value == rule_type]
@@ -238,7 +243,8 @@ async def search_rules(
             rules = [rule for rule in rules if rule.confidence_score >= min_confidence]
         
         if source_document:
-            rules = [rule for rule in rules if source_document.lower() in rule.source_document.lower()]
+            source_regex = re.compile(re.escape(source_document), re.IGNORECASE)
+            rules = [rule for rule in rules if source_regex.search(rule.source_document) is not None]
         
         return rules
         
@@ -344,17 +350,19 @@ async def get_parser_stats():
     processed_documents = sum(1 for doc in documents_storage.values() if doc.processed)
     total_rules = len(rules_storage)
     
-    rule_types = {}
+    # Count rule types and total confidence in a single pass
+    rule_types = Counter()
+    total_confidence = 0.0
     for rule in rules_storage.values():
-        rule_type = rule.rule_type.value
-        rule_types[rule_type] = rule_types.get(rule_type, 0) + 1
+        rule_types[rule.rule_type.value] += 1
+        total_confidence += rule.confidence_score
     
-    avg_confidence = sum(rule.confidence_score for rule in rules_storage.values()) / total_rules if total_rules > 0 else 0
+    avg_confidence = total_confidence / total_rules if total_rules > 0 else 0
     
     return {
         "total_documents": total_documents,
         "processed_documents": processed_documents,
         "total_rules": total_rules,
-        "rule_types": rule_types,
+        "rule_types": dict(rule_types),
         "average_confidence": round(avg_confidence, 3)
     }
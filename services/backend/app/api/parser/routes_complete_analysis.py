@@ -131,8 +131,6 @@ async def run_full_gap_analysis():
     except Exception as e:
         print(f"❌ Error in complete gap analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Complete gap analysis failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/analysis-status")
 async def get_analysis_status():
@@ -151,7 +149,6 @@ async def get_analysis_status():
         await db.connect()
         prisma = db.get_client()
         requirements_count = await prisma.finalcompliancerequirement.count()
-        await db.disconnect()
         
         return {
             "system_status": "operational",
@@ -39,8 +39,6 @@ async def get_all_gap_analyses():
             }
             analyses_data.append(analysis_dict)
         
-        await db.disconnect()
-        
         return {
             "success": True,
             "total_analyses": len(analyses_data),
@@ -50,5 +48,3 @@ async def get_all_gap_analyses():
     except Exception as e:
         print(f"Error fetching gap analyses: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch gap analyses: {str(e)}")
-    finally:
-        await db.disconnect()
@@ -95,8 +95,6 @@ async def analyze_orion_data():
     except Exception as e:
         print(f"❌ Error in gap analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Gap analysis failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/findings/{analysis_id}")
 async def get_findings(analysis_id: str):
@@ -122,8 +120,6 @@ async def get_findings(analysis_id: str):
     except Exception as e:
         print(f"❌ Error getting findings: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get findings: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/tasks/{analysis_id}")
 async def get_tasks(analysis_id: str):
@@ -148,8 +144,6 @@ async def get_tasks(analysis_id: str):
     except Exception as e:
         print(f"❌ Error getting tasks: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get tasks: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/chunk-analysis")
 async def perform_chunked_analysis():
@@ -237,8 +231,6 @@ async def perform_chunked_analysis():
     except Exception as e:
         print(f"❌ Error in chunked analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Chunked analysis failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/analysis-summary/{analysis_id}")
 async def get_analysis_summary(analysis_id: str):
@@ -285,8 +277,6 @@ async def get_analysis_summary(analysis_id: str):
     except Exception as e:
         print(f"❌ Error getting analysis summary: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get analysis summary: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/all-analyses")
 async def get_all_analyses():
@@ -320,8 +310,6 @@ async def get_all_analyses():
     except Exception as e:
         print(f"❌ Error getting all analyses: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get analyses: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/comprehensive-analysis")
 async def perform_comprehensive_analysis():
@@ -390,8 +378,6 @@ async def perform_comprehensive_analysis():
     except Exception as e:
         print(f"❌ Error in comprehensive analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Comprehensive analysis failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 async def _load_orion_data() -> Optional[Dict[str, Any]]:
     """Load Orion 10-K data from the JSON file."""
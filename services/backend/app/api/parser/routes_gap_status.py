@@ -36,8 +36,6 @@ async def get_all_gap_analyses():
             }
             analyses_data.append(analysis_dict)
         
-        await db.disconnect()
-        
         return {
             "success": True,
             "total_analyses": len(analyses_data),
@@ -47,8 +45,6 @@ async def get_all_gap_analyses():
     except Exception as e:
         print(f"Error fetching gap analyses: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch gap analyses: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/status-summary")
 async def get_status_summary():
@@ -73,8 +69,6 @@ async def get_status_summary():
         total_score = sum(analysis.complianceScore for analysis in analyses)
         avg_score = total_score / len(analyses) if analyses else 0
         
-        await db.disconnect()
-        
         return {
             "success": True,
             "status_counts": status_counts,
@@ -85,8 +79,6 @@ async def get_status_summary():
     except Exception as e:
         print(f"Error getting status summary: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get status summary: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/{analysis_id}")
 async def get_gap_analysis_by_id(analysis_id: str):
@@ -116,8 +108,6 @@ async def get_gap_analysis_by_id(analysis_id: str):
             "tasks": analysis.tasks
         }
         
-        await db.disconnect()
-        
         return {
             "success": True,
             "analysis": analysis_data
@@ -128,8 +118,6 @@ async def get_gap_analysis_by_id(analysis_id: str):
     except Exception as e:
         print(f"Error fetching gap analysis: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch gap analysis: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/recent/{limit}")
 async def get_recent_analyses(limit: int = 5):
@@ -158,8 +146,6 @@ async def get_recent_analyses(limit: int = 5):
             }
             analyses_data.append(analysis_dict)
         
-        await db.disconnect()
-        
         return {
             "success": True,
             "total_analyses": len(analyses_data),
@@ -169,5 +155,3 @@ async def get_recent_analyses(limit: int = 5):
     except Exception as e:
         print(f"Error fetching recent analyses: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch recent analyses: {str(e)}")
-    finally:
-        await db.disconnect()
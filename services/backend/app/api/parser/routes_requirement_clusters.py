@@ -55,8 +55,6 @@ async def get_all_requirement_clusters():
                 continue
         
         print(f"Successfully processed {len(clusters_data)} clusters")
-        await db.disconnect()
-        print("Database disconnected")
         
         return {
             "success": True,
@@ -70,11 +68,6 @@ async def get_all_requirement_clusters():
         import traceback
         print(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Failed to fetch requirement clusters: {str(e)}")
-    finally:
-        try:
-            await db.disconnect()
-        except:
-            pass
 
 @router.get("/count")
 async def get_clusters_count():
@@ -87,8 +80,6 @@ async def get_clusters_count():
         
         count = await prisma.requirementcluster.count()
         
-        await db.disconnect()
-        
         return {
             "success": True,
             "total_count": count
@@ -97,5 +88,3 @@ async def get_clusters_count():
     except Exception as e:
         print(f"Error getting clusters count: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get clusters count: {str(e)}")
-    finally:
-        await db.disconnect()
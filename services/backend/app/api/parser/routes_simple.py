@@ -257,8 +257,6 @@ async def upload_document(file: UploadFile = File(...)):
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/extract-requirements/{document_id}", response_model=ComplianceRequirementExtractionResponse)
 async def extract_compliance_requirements(document_id: str):
@@ -384,8 +382,6 @@ async def extract_compliance_requirements(document_id: str):
         except:
             pass
         raise HTTPException(status_code=500, detail=f"Error extracting requirements: {str(e)}")
-    finally:
-        await db.disconnect()
 
 def extract_requirements_simple(text: str) -> List[ComplianceRequirement]:
     """Simple requirement extraction without heavy dependencies."""
@@ -676,8 +672,6 @@ async def get_all_requirements():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching requirements: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/requirements/{requirement_id}")
 async def get_requirement(requirement_id: str):
@@ -705,8 +699,6 @@ async def get_requirement(requirement_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching requirement: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/documents")
 async def list_documents():
@@ -725,8 +717,6 @@ async def list_documents():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching documents: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/documents/{document_id}")
 async def get_document(document_id: str):
@@ -757,8 +747,6 @@ async def get_document(document_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching document: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/stats")
 async def get_parser_stats():
@@ -797,8 +785,6 @@ async def get_parser_stats():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stats: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.delete("/documents/{document_id}")
 async def delete_document(document_id: str):
@@ -827,8 +813,6 @@ async def delete_document(document_id: str):
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error deleting document: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/cluster-requirements")
 async def cluster_requirements():
@@ -897,8 +881,6 @@ async def cluster_requirements():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error clustering requirements: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/harmonize-requirements")
 async def harmonize_requirements():
@@ -962,8 +944,6 @@ async def harmonize_requirements():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error harmonizing requirements: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/organize-with-llm")
 async def organize_requirements_with_llm():
@@ -1034,8 +1014,6 @@ async def organize_requirements_with_llm():
     except Exception as e:
         print(f"❌ Error in LLM organization: {e}")
         raise HTTPException(status_code=500, detail=f"LLM organization failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/format-requirement/{requirement_id}")
 async def format_individual_requirement(requirement_id: str):
@@ -1083,8 +1061,6 @@ async def format_individual_requirement(requirement_id: str):
     except Exception as e:
         print(f"❌ Error formatting individual requirement: {e}")
         raise HTTPException(status_code=500, detail=f"Individual requirement formatting failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/llm-organized-requirements")
 async def get_llm_organized_requirements():
@@ -1111,8 +1087,6 @@ async def get_llm_organized_requirements():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving organized requirements: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/generate-control-mappings/{requirement_id}")
 async def generate_control_mappings(requirement_id: str):
@@ -1156,8 +1130,6 @@ async def generate_control_mappings(requirement_id: str):
     except Exception as e:
         print(f"❌ Error generating control mappings: {e}")
         raise HTTPException(status_code=500, detail=f"Control mapping generation failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/stored-clusters")
 async def get_stored_clusters():
@@ -1175,8 +1147,6 @@ async def get_stored_clusters():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving clusters: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/stored-llm-organized")
 async def get_stored_llm_organized():
@@ -1194,8 +1164,6 @@ async def get_stored_llm_organized():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving LLM organized data: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/final-organized-requirements")
 async def get_final_organized_requirements():
@@ -1267,8 +1235,6 @@ async def get_final_organized_requirements():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving organized requirements: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.get("/stored-harmonized")
 async def get_stored_harmonized():
@@ -1286,8 +1252,6 @@ async def get_stored_harmonized():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error retrieving harmonized data: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/process-document-complete")
 async def process_document_complete(file: UploadFile = File(...)):
@@ -1658,8 +1622,6 @@ async def process_document_complete(file: UploadFile = File(...)):
         except:
             pass
         raise HTTPException(status_code=500, detail=f"Complete processing pipeline failed: {str(e)}")
-    finally:
-        await db.disconnect()
 
 @router.post("/test-storage")
 async def test_storage():
@@ -1700,5 +1662,3 @@ async def test_storage():
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Test storage failed: {str(e)}")
-    finally:
-        await db.disconnect()
@@ -7,28 +7,156 @@ import os
 import json
 import uuid
 import asyncio
-from typing import List, Dict, Any, Optional
+import re
+import string
+import orjson
+from collections import Counter
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from openai import AsyncOpenAI
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
 # Load environment variables
 load_dotenv()
 
+_token_encoder = None
+_shared_client: Optional["AsyncOpenAI"] = None
+
+def _get_client() -> "AsyncOpenAI":
+    """Return the process-wide OpenAI client so generators share one connection pool."""
+    global _shared_client
+    if _shared_client is None:
+        # Imported here so loading this module does not pull in the OpenAI SDK
+        import httpx
+        from openai import AsyncOpenAI
+        
+        _shared_client = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+                timeout=httpx.Timeout(60, connect=5),
+                http2=True
+            )
+        )
+    return _shared_client
+
+async def warm_up_shared_client(timeout: float = 2.0):
+    """Open a connection on the shared OpenAI client ahead of the first request.
+    
+    Resolves DNS and completes the TLS handshake with a cheap models.list()
+    call. Failures are ignored so startup never depends on OpenAI.
+    """
+    try:
+        await asyncio.wait_for(_get_client().models.list(), timeout=timeout)
+    except Exception as e:
+        print(f"⚠️  OpenAI client warm-up skipped: {e}")
+
+async def close_shared_client():
+    """Close the shared OpenAI client and its connection pool."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.close()
+        _shared_client = None
+
+def _dumps_indented(data: Any) -> str:
+    """Serialize data as indented JSON for prompts."""
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+
+def _count_tokens(text: str) -> int:
+    """Estimate the OpenAI token count of a string."""
+    global _token_encoder
+    if _token_encoder is None:
+        try:
+            import tiktoken
+            _token_encoder = tiktoken.encoding_for_model("gpt-3.5-turbo")
+        except Exception as e:
+            # Missing tiktoken, or its BPE file could not be downloaded;
+            # fall back to the ~4 characters per token rule of thumb
+            print(f"⚠️  tiktoken unavailable, estimating token counts: {e}")
+            _token_encoder = False
+    if _token_encoder is False:
+        return len(text) // 4 + 1
+    return len(_token_encoder.encode(text))
+
+class _FindingsStreamParser:
+    """Incrementally extract finding objects from a streamed findings JSON response."""
+    
+    _FINDINGS_ARRAY = re.compile(r'"findings"\s*:\s*\[')
+    
+    def __init__(self):
+        self.text = ""
+        self.found_array = False
+        self.finished = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._object_start = 0
+    
+    def feed(self, delta: str) -> List[Dict[str, Any]]:
+        """Append streamed text and return any findings completed by it."""
+        self.text += delta
+        completed = []
+        
+        if not self.found_array:
+            match = self._FINDINGS_ARRAY.search(self.text)
+            if not match:
+                return completed
+            self.found_array = True
+            self._pos = match.end()
+        
+        text = self.text
+        while self._pos < len(text) and not self.finished:
+            char = text[self._pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char == '{':
+                if self._depth == 0:
+                    self._object_start = self._pos
+                self._depth += 1
+            elif char == '}':
+                self._depth -= 1
+                if self._depth == 0:
+                    try:
+                        completed.append(orjson.loads(text[self._object_start:self._pos + 1]))
+                    except orjson.JSONDecodeError:
+                        pass
+            elif char == ']' and self._depth == 0:
+                self.finished = True
+            self._pos += 1
+        
+        return completed
+
 class SimpleFindingsGenerator:
     """Simple findings generator using chunking and OpenAI."""
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        self.client = _get_client()
         self.findings_prompt = self._load_findings_prompt()
-        self.chunk_size = 1000  # Configurable chunk size
+        self.chunk_size = 1000  # Configurable chunk size, in tokens
+        self.chunk_bytes = self.chunk_size * 4  # ~4 bytes of JSON per token
+        self.pack_max_tokens = 3000  # Token budget for chunks packed into one request
+        self.chunk_output_tokens = 2000  # Completion budget per packed section
+        self.pack_max_chunks = 2  # Sections per request; keeps the scaled budget under the 4096 output cap
     
-    def _load_findings_prompt(self) -> str:
-        """Load the findings generation prompt."""
-        return """
+    def _load_findings_prompt(self) -> Tuple[str, str, str, str]:
+        """Load the findings generation prompt, pre-split around its
+        {section_ids}, {company_data} and {requirements} slots."""
+        template = """
 You are a SEC compliance expert analyzing company data for compliance findings.
 
-Company Data Chunk:
+Sections: [{section_ids}]
+
+Company Data Chunk (keyed by section id):
 {company_data}
 
 Compliance Requirements:
@@ -44,6 +172,7 @@ For each finding, provide:
 5. Priority level (1-5, where 5 is highest)
 6. Business impact assessment
 7. Responsible party
+8. Source section (the section id the finding is based on)
 
 Focus on:
 - Financial reporting completeness
@@ -75,7 +204,8 @@ Return ONLY valid JSON with this structure:
       "business_impact": "High - regulatory compliance risk and potential SEC enforcement",
       "responsible_party": "CFO and Accounting Team",
       "estimated_effort": "2-3 months",
-      "deadline": "Next 10-K filing"
+      "deadline": "Next 10-K filing",
+      "source_section": "financial_statements_chunk_1"
     }}
   ],
   "summary": {{
@@ -88,6 +218,18 @@ Return ONLY valid JSON with this structure:
 
 Important: Return ONLY valid JSON. No additional text or explanations.
 """
+        # Formatter.parse un-doubles the escaped braces in the literal parts
+        parts = [""]
+        for literal, field_name, _spec, _conversion in string.Formatter().parse(template):
+            parts[-1] += literal
+            if field_name is not None:
+                parts.append("")
+        return tuple(parts)
+
+    def _render_findings_prompt(self, section_ids: str, company_data_str: str, requirements_str: str) -> str:
+        """Fill the pre-split findings prompt without re-parsing the template."""
+        prefix, after_sections, after_company_data, suffix = self.findings_prompt
+        return prefix + section_ids + after_sections + company_data_str + after_company_data + requirements_str + suffix
 
     async def generate_findings_from_chunks(self, company_data: Dict[str, Any], requirements: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Generate findings using chunked data processing."""
@@ -100,12 +242,20 @@ Important: Return ONLY valid JSON. No additional text or explanations.
             all_findings = []
             total_chunks = len(data_chunks)
             
-            # Process each chunk
-            for i, chunk in enumerate(data_chunks):
-                print(f"Processing chunk {i+1}/{total_chunks}: {chunk['section']}")
+            # Pack small chunks together so each request carries several sections.
+            # Token counting may load tiktoken's BPE file, so keep it off the event loop.
+            packs = await asyncio.to_thread(self._pack_chunks, data_chunks, self.pack_max_tokens, self.pack_max_chunks)
+            
+            # Requirements are identical for every request, so serialize them once
+            requirements_str = _dumps_indented(requirements)
+            
+            # Process each pack
+            for i, pack in enumerate(packs):
+                sections = ", ".join(chunk["chunk_id"] for chunk in pack)
+                print(f"Processing request {i+1}/{len(packs)}: {sections}")
                 
-                # Generate findings for this chunk
-                chunk_findings = await self._generate_findings_for_chunk(chunk, requirements)
+                # Generate findings for the chunks in this pack
+                chunk_findings = await self._generate_findings_for_chunk(pack, requirements_str)
                 all_findings.extend(chunk_findings)
             
             # Deduplicate findings
@@ -121,6 +271,7 @@ Important: Return ONLY valid JSON. No additional text or explanations.
                 "summary": summary,
                 "processing_metadata": {
                     "total_chunks": total_chunks,
+                    "total_requests": len(packs),
                     "total_findings": len(unique_findings),
                     "deduplication_ratio": len(all_findings) / len(unique_findings) if unique_findings else 1.0
                 }
@@ -130,64 +281,178 @@ Important: Return ONLY valid JSON. No additional text or explanations.
             print(f"❌ Error in chunked findings generation: {e}")
             return {"findings": [], "summary": {}, "error": str(e)}
 
-    async def _generate_findings_for_chunk(self, chunk: Dict[str, Any], requirements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Generate findings for a specific data chunk."""
+    async def generate_findings_batched(self, company_data: Dict[str, Any], requirements: List[Dict[str, Any]], poll_interval: float = 30.0) -> Dict[str, Any]:
+        """Generate findings through the OpenAI Batch API for background runs.
+        
+        Cheaper than generate_findings_from_chunks for large runs, but results
+        can take up to the 24h completion window.
+        """
         try:
-            # Prepare data for LLM
-            company_data_str = json.dumps(chunk["data"], indent=2)
-            requirements_str = json.dumps(requirements, indent=2)
+            print("🔍 Starting batched findings generation...")
             
-            # Call OpenAI API
-            response = await self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a SEC compliance expert. Return ONLY valid JSON."},
-                    {"role": "user", "content": self.findings_prompt.format(
-                        company_data=company_data_str,
-                        requirements=requirements_str
-                    )}
-                ],
-                temperature=0.2,
-                max_tokens=2000
+            data_chunks = self._chunk_company_data(company_data)
+            packs = await asyncio.to_thread(self._pack_chunks, data_chunks, self.pack_max_tokens, self.pack_max_chunks)
+            requirements_str = _dumps_indented(requirements)
+            
+            # One batch request per pack, keyed by the pack's first chunk id
+            packs_by_id = {pack[0]["chunk_id"]: pack for pack in packs}
+            batch_lines = [
+                orjson.dumps({
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self._build_chunk_request(pack, requirements_str)
+                })
+                for custom_id, pack in packs_by_id.items()
+            ]
+            
+            # Upload the requests and start the batch
+            batch_file = await self.client.files.create(
+                file=("findings_batch.jsonl", b"\n".join(batch_lines)),
+                purpose="batch"
+            )
+            batch = await self.client.batches.create(
+                input_file_id=batch_file.id,
+                endpoint="/v1/chat/completions",
+                completion_window="24h"
             )
+            print(f"Submitted batch {batch.id} with {len(batch_lines)} requests")
             
-            # Parse response
-            llm_output = response.choices[0].message.content
-            findings_data = self._parse_findings_response(llm_output)
+            # Poll until the batch reaches a terminal state
+            while batch.status not in ("completed", "failed", "expired", "cancelled"):
+                await asyncio.sleep(poll_interval)
+                batch = await self.client.batches.retrieve(batch.id)
             
-            # Add chunk metadata to findings
-            for finding in findings_data.get("findings", []):
-                finding["chunk_section"] = chunk["section"]
-                finding["chunk_id"] = chunk["chunk_id"]
-                finding["id"] = finding.get("id", str(uuid.uuid4()))
+            if batch.status != "completed" or not batch.output_file_id:
+                raise RuntimeError(f"Batch {batch.id} ended with status {batch.status}")
             
-            return findings_data.get("findings", [])
+            # Map each result back to its pack and parse the findings
+            output = await self.client.files.content(batch.output_file_id)
+            all_findings = []
+            for line in output.text.splitlines():
+                if not line.strip():
+                    continue
+                result = orjson.loads(line)
+                pack = packs_by_id.get(result.get("custom_id"))
+                response = result.get("response") or {}
+                if pack is None or response.get("status_code") != 200:
+                    print(f"❌ Batch request {result.get('custom_id')} failed: {result.get('error')}")
+                    continue
+                
+                llm_output = response["body"]["choices"][0]["message"]["content"]
+                chunks_by_id = {chunk["chunk_id"]: chunk for chunk in pack}
+                for finding in self._parse_findings_response(llm_output).get("findings", []):
+                    self._tag_finding(finding, chunks_by_id, pack[0])
+                    all_findings.append(finding)
+            
+            unique_findings = self._deduplicate_findings(all_findings)
+            summary = self._calculate_summary(unique_findings)
+            
+            print(f"✅ Generated {len(unique_findings)} unique findings from batch {batch.id}")
+            
+            return {
+                "findings": unique_findings,
+                "summary": summary,
+                "processing_metadata": {
+                    "batch_id": batch.id,
+                    "total_chunks": len(data_chunks),
+                    "total_requests": len(packs),
+                    "total_findings": len(unique_findings),
+                    "deduplication_ratio": len(all_findings) / len(unique_findings) if unique_findings else 1.0
+                }
+            }
+            
+        except Exception as e:
+            print(f"❌ Error in batched findings generation: {e}")
+            return {"findings": [], "summary": {}, "error": str(e)}
+
+    def _build_chunk_request(self, pack: List[Dict[str, Any]], requirements_str: str) -> Dict[str, Any]:
+        """Build the chat completion parameters for a pack of data chunks."""
+        company_data_str = _dumps_indented({chunk["chunk_id"]: chunk["data"] for chunk in pack})
+        
+        return {
+            "model": "gpt-3.5-turbo",
+            "messages": [
+                {"role": "system", "content": "You are a SEC compliance expert. Return ONLY valid JSON."},
+                {"role": "user", "content": self._render_findings_prompt(
+                    ", ".join(chunk["chunk_id"] for chunk in pack),
+                    company_data_str,
+                    requirements_str
+                )}
+            ],
+            "temperature": 0.2,
+            # Each section keeps its own output budget so later sections aren't truncated
+            "max_tokens": self.chunk_output_tokens * len(pack)
+        }
+
+    async def _generate_findings_for_chunk(self, pack: List[Dict[str, Any]], requirements_str: str) -> List[Dict[str, Any]]:
+        """Generate findings for a pack of data chunks in a single request."""
+        try:
+            chunks_by_id = {chunk["chunk_id"]: chunk for chunk in pack}
+            
+            # Call OpenAI API, streaming the completion
+            stream = await self.client.chat.completions.create(
+                **self._build_chunk_request(pack, requirements_str),
+                stream=True
+            )
+            
+            # Pick up each finding as soon as its JSON object is complete
+            parser = _FindingsStreamParser()
+            findings = []
+            async for event in stream:
+                if not event.choices:
+                    continue
+                for finding in parser.feed(event.choices[0].delta.content or ""):
+                    self._tag_finding(finding, chunks_by_id, pack[0])
+                    findings.append(finding)
+            
+            # Fall back to whole-response parsing if the model did not use a findings array
+            if not parser.found_array:
+                findings = self._parse_findings_response(parser.text).get("findings", [])
+                for finding in findings:
+                    self._tag_finding(finding, chunks_by_id, pack[0])
+            
+            return findings
             
         except Exception as e:
-            print(f"❌ Error generating findings for chunk {chunk.get('chunk_id', 'unknown')}: {e}")
+            chunk_ids = ", ".join(chunk.get("chunk_id", "unknown") for chunk in pack)
+            print(f"❌ Error generating findings for chunks {chunk_ids}: {e}")
             return []
 
+    def _tag_finding(self, finding: Dict[str, Any], chunks_by_id: Dict[str, Dict[str, Any]], default_chunk: Dict[str, Any]):
+        """Add chunk metadata to a finding, falling back to the default chunk
+        when the model omits or invents a source section."""
+        chunk = chunks_by_id.get(finding.get("source_section"), default_chunk)
+        finding["chunk_section"] = chunk["section"]
+        finding["chunk_id"] = chunk["chunk_id"]
+        finding["id"] = finding.get("id", str(uuid.uuid4()))
+
     def _chunk_company_data(self, company_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Chunk company data into manageable sections."""
         chunks = []
         
+        # Look up each 10-K part once; missing sections stay None
+        part1 = company_data.get("part1") or {}
+        part2 = company_data.get("part2") or {}
+        part3 = company_data.get("part3") or {}
+        
         # Define key sections to analyze
         key_sections = {
-            "company_info": company_data.get("company", {}),
-            "financial_statements": company_data.get("part2", {}).get("item8_financial_statements", {}),
-            "risk_factors": company_data.get("part1", {}).get("item1a_risk_factors", []),
-            "governance": company_data.get("part3", {}).get("item10_directors_executives_governance", {}),
-            "executive_compensation": company_data.get("part3", {}).get("item11_executive_compensation", {}),
-            "controls": company_data.get("part2", {}).get("item9a_controls_and_procedures", {}),
-            "segment_disclosures": company_data.get("segment_disclosures", {}),
-            "notes_to_financials": company_data.get("notes_to_financials", {})
+            "company_info": company_data.get("company"),
+            "financial_statements": part2.get("item8_financial_statements"),
+            "risk_factors": part1.get("item1a_risk_factors"),
+            "governance": part3.get("item10_directors_executives_governance"),
+            "executive_compensation": part3.get("item11_executive_compensation"),
+            "controls": part2.get("item9a_controls_and_procedures"),
+            "segment_disclosures": company_data.get("segment_disclosures"),
+            "notes_to_financials": company_data.get("notes_to_financials")
         }
         
         # Create chunks for each section
         for section_name, section_data in key_sections.items():
             if section_data:
                 # For large sections, create sub-chunks
-                if isinstance(section_data, dict) and len(str(section_data)) > self.chunk_size:
+                if isinstance(section_data, dict) and len(orjson.dumps(section_data)) > self.chunk_bytes:
                     sub_chunks = self._create_sub_chunks(section_data, section_name)
                     chunks.extend(sub_chunks)
                 else:
@@ -216,59 +481,83 @@ Important: Return ONLY valid JSON. No additional text or explanations.
         
         return chunks
 
-    def _parse_findings_response(self, llm_output: str) -> Dict[str, Any]:
+    def _pack_chunks(self, chunks: List[Dict[str, Any]], max_tokens: int = 3000, max_chunks: int = 2) -> List[List[Dict[str, Any]]]:
+        """Greedily pack chunks into groups that fit within a token budget and chunk count."""
+        packs = []
+        current_pack = []
+        current_tokens = 0
+        
+        for chunk in chunks:
+            chunk_tokens = _count_tokens(_dumps_indented(chunk["data"]))
+            
+            # Start a new pack when this chunk would overflow the budget or the
+            # pack is full; oversized chunks still get a pack of their own
+            if current_pack and (current_tokens + chunk_tokens > max_tokens or len(current_pack) >= max_chunks):
+                packs.append(current_pack)
+                current_pack = []
+                current_tokens = 0
+            
+            current_pack.append(chunk)
+            current_tokens += chunk_tokens
+        
+        if current_pack:
+            packs.append(current_pack)
+        
+        return packs
+
+    def _parse_findings_response(self, llm_output: str, max_attempts: int = 5) -> Dict[str, Any]:
         """Parse findings response from LLM."""
         try:
-            # Clean and extract JSON
             cleaned_output = llm_output.strip()
-            json_start = cleaned_output.find('{')
-            json_end = cleaned_output.rfind('}') + 1
             
-            if json_start == -1 or json_end == 0:
-                raise ValueError("No valid JSON found in LLM response")
+            # Fast path: the whole response is a JSON object
+            if cleaned_output.startswith('{') and cleaned_output.endswith('}'):
+                try:
+                    return orjson.loads(cleaned_output)
+                except orjson.JSONDecodeError:
+                    pass
+            
+            # Decode the first complete JSON object, skipping any surrounding prose
+            decoder = json.JSONDecoder()
+            json_start = cleaned_output.find('{')
+            for _ in range(max_attempts):
+                if json_start == -1:
+                    break
+                try:
+                    findings_data, _end = decoder.raw_decode(cleaned_output, json_start)
+                    return findings_data
+                except json.JSONDecodeError:
+                    json_start = cleaned_output.find('{', json_start + 1)
             
-            json_str = cleaned_output[json_start:json_end]
-            return json.loads(json_str)
+            raise ValueError("No valid JSON found in LLM response")
             
         except Exception as e:
             print(f"❌ Error parsing findings response: {e}")
             return {"findings": []}
 
-    def _deduplicate_findings(self, findings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate_findings(self, findings: List[Dict[str, Any]], threshold: float = 0.8) -> List[Dict[str, Any]]:
         """Remove duplicate findings based on title similarity."""
         unique_findings = []
-        seen_titles = set()
+        seen_word_sets = []  # Word set of each kept title, computed once
         
         for finding in findings:
-            title = finding.get("title", "").lower().strip()
+            words = frozenset(finding.get("title", "").lower().split())
             
-            # Check for similarity with existing findings
+            # Check for similarity with existing findings using word overlap
             is_duplicate = False
-            for seen_title in seen_titles:
-                if self._titles_similar(title, seen_title):
-                    is_duplicate = True
-                    break
+            if words:
+                for seen_words in seen_word_sets:
+                    if len(words & seen_words) / len(words | seen_words) >= threshold:
+                        is_duplicate = True
+                        break
             
             if not is_duplicate:
                 unique_findings.append(finding)
-                seen_titles.add(title)
+                if words:
+                    seen_word_sets.append(words)
         
         return unique_findings
 
-    def _titles_similar(self, title1: str, title2: str, threshold: float = 0.8) -> bool:
-        """Check if two titles are similar using simple word overlap."""
-        words1 = set(title1.split())
-        words2 = set(title2.split())
-        
-        if not words1 or not words2:
-            return False
-        
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-        
-        similarity = len(intersection) / len(union)
-        return similarity >= threshold
-
     def _calculate_summary(self, findings: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Calculate summary statistics for findings."""
         if not findings:
@@ -280,35 +569,22 @@ Important: Return ONLY valid JSON. No additional text or explanations.
                 "categories": {}
             }
         
-        priority_counts = {"high": 0, "medium": 0, "low": 0}
-        category_counts = {}
-        severity_counts = {"High": 0, "Medium": 0, "Low": 0}
-        
-        for finding in findings:
-            # Count by priority (1-5 scale)
-            priority = finding.get("priority", 3)
-            if priority >= 4:
-                priority_counts["high"] += 1
-            elif priority >= 3:
-                priority_counts["medium"] += 1
-            else:
-                priority_counts["low"] += 1
-            
-            # Count by category
-            category = finding.get("category", "General")
-            category_counts[category] = category_counts.get(category, 0) + 1
-            
-            # Count by severity
-            severity = finding.get("severity", "Medium")
-            severity_counts[severity] = severity_counts.get(severity, 0) + 1
+        # Count by priority (1-5 scale), category and severity
+        priority_counts = Counter(
+            "high" if priority >= 4 else "medium" if priority >= 3 else "low"
+            for priority in (finding.get("priority", 3) for finding in findings)
+        )
+        category_counts = Counter(finding.get("category", "General") for finding in findings)
+        severity_counts = Counter({"High": 0, "Medium": 0, "Low": 0})
+        severity_counts.update(finding.get("severity", "Medium") for finding in findings)
         
         return {
             "total_findings": len(findings),
             "high_priority": priority_counts["high"],
             "medium_priority": priority_counts["medium"],
             "low_priority": priority_counts["low"],
-            "categories": category_counts,
-            "severity_breakdown": severity_counts
+            "categories": dict(category_counts),
+            "severity_breakdown": dict(severity_counts)
         }
 
     async def generate_simple_findings(self, company_data: Dict[str, Any], requirements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
@@ -317,17 +593,18 @@ Important: Return ONLY valid JSON. No additional text or explanations.
             print("🔍 Generating simple findings...")
             
             # Prepare data for LLM
-            company_data_str = json.dumps(company_data, indent=2)
-            requirements_str = json.dumps(requirements, indent=2)
+            company_data_str = _dumps_indented(company_data)
+            requirements_str = _dumps_indented(requirements)
             
             # Call OpenAI API
             response = await self.client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {"role": "system", "content": "You are a SEC compliance expert. Return ONLY valid JSON."},
-                    {"role": "user", "content": self.findings_prompt.format(
-                        company_data=company_data_str,
-                        requirements=requirements_str
+                    {"role": "user", "content": self._render_findings_prompt(
+                        "company_data",
+                        company_data_str,
+                        requirements_str
                     )}
                 ],
                 temperature=0.2,
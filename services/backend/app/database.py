@@ -1,5 +1,6 @@
 from prisma import Prisma
-from typing import Optional
+from typing import AsyncIterator, Optional
+from contextlib import asynccontextmanager
 import asyncio
 
 class Database:
@@ -9,8 +10,15 @@ class Database:
     async def connect(self):
         """Connect to the database."""
         if self.prisma is None:
-            self.prisma = Prisma()
-            await self.prisma.connect()
+            # Only keep the client once it has connected, so a failed attempt
+            # (e.g. Postgres down at startup) is retried on the next call
+            prisma = Prisma()
+            await prisma.connect()
+            if self.prisma is None:
+                self.prisma = prisma
+            else:
+                # Another request connected while this one was waiting
+                await prisma.disconnect()
     
     async def disconnect(self):
         """Disconnect from the database."""
@@ -23,6 +31,17 @@ class Database:
         if self.prisma is None:
             raise RuntimeError("Database not connected. Call connect() first.")
         return self.prisma
+    
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Prisma]:
+        """Yield a connected client, disconnecting afterwards only if this call connected it."""
+        owns_connection = self.prisma is None
+        await self.connect()
+        try:
+            yield self.prisma
+        finally:
+            if owns_connection:
+                await self.disconnect()
 
 # Global database instance
 db = Database()
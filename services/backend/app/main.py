@@ -2,6 +2,8 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api import health
 from app.api.parser.routes_simple import router as regtech_router
+from app.api.parser.simple_findings_generator import close_shared_client, warm_up_shared_client
+from app.database import db
 
 app = FastAPI(title="SEC Compliance RegTech Platform")
 
@@ -16,3 +18,18 @@ app.add_middleware(
 
 app.include_router(health.router, prefix="/health")
 app.include_router(regtech_router, prefix="/regtech", tags=["regtech"])
+
+@app.on_event("startup")
+async def warm_up_connections():
+    """Connect to the database and warm the OpenAI client before the first request."""
+    try:
+        await db.connect()
+    except Exception as e:
+        print(f"⚠️  Database warm-up skipped, retrying on first request: {e}")
+    await warm_up_shared_client()
+
+@app.on_event("shutdown")
+async def close_connections():
+    """Close the database connection and the shared OpenAI connection pool."""
+    await db.disconnect()
+    await close_shared_client()
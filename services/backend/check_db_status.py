@@ -18,27 +18,26 @@ def check_database_status():
                 await db.connect()
                 prisma = db.get_client()
                 
-                # Check documents
-                doc_count = await prisma.document.count()
-                print(f"📄 Documents in database: {doc_count}")
+                # Run all status queries concurrently
+                doc_count, req_count, user_count, docs, reqs = await asyncio.gather(
+                    prisma.document.count(),
+                    prisma.compliancerequirement.count(),
+                    prisma.user.count(),
+                    prisma.document.find_many(take=3),
+                    prisma.compliancerequirement.find_many(take=3)
+                )
                 
-                # Check requirements
-                req_count = await prisma.compliancerequirement.count()
+                print(f"📄 Documents in database: {doc_count}")
                 print(f"📋 Compliance requirements in database: {req_count}")
-                
-                # Check users
-                user_count = await prisma.user.count()
                 print(f"👤 Users in database: {user_count}")
                 
                 if doc_count > 0:
                     print("\n📄 Sample documents:")
-                    docs = await prisma.document.find_many(take=3)
                     for doc in docs:
                         print(f"   - {doc.filename} (ID: {doc.id})")
                 
                 if req_count > 0:
                     print("\n📋 Sample requirements:")
-                    reqs = await prisma.compliancerequirement.find_many(take=3)
                     for req in reqs:
                         print(f"   - {req.title} (ID: {req.id})")
                 
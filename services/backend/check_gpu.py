@@ -3,11 +3,11 @@
 Check GPU/CUDA availability and system information.
 """
 
-import torch
 import sys
 
 def check_gpu_availability():
     """Check GPU availability and system info."""
+    import torch
     
     print("🔍 GPU/CUDA Availability Check")
     print("=" * 50)
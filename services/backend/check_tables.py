@@ -5,6 +5,7 @@ Check if organization tables exist
 
 import sys
 import os
+import asyncio
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 async def check_tables():
@@ -25,12 +26,16 @@ async def check_tables():
             ("FinalComplianceRequirement", "finalcompliancerequirement")
         ]
         
-        for table_name, prisma_name in tables:
-            try:
-                await getattr(prisma, prisma_name).find_many(take=1)
+        results = await asyncio.gather(
+            *(getattr(prisma, prisma_name).find_many(take=1) for _, prisma_name in tables),
+            return_exceptions=True
+        )
+        
+        for (table_name, _), result in zip(tables, results):
+            if isinstance(result, Exception):
+                print(f"ERROR: {table_name} table missing - {result}")
+            else:
                 print(f"OK: {table_name} table exists")
-            except Exception as e:
-                print(f"ERROR: {table_name} table missing - {e}")
         
         await db.disconnect()
         
@@ -39,7 +44,6 @@ async def check_tables():
 
 def main():
     """Run table check."""
-    import asyncio
     asyncio.run(check_tables())
 
 if __name__ == "__main__":
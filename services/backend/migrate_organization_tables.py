@@ -7,6 +7,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+# Organization tables and the Prisma models that own them
+ORGANIZATION_TABLES = {
+    "requirement_clusters": "RequirementCluster",
+    "llm_organized_requirements": "LLMOrganizedRequirement",
+    "harmonized_requirements": "HarmonizedRequirement",
+    "final_compliance_requirements": "FinalComplianceRequirement",
+}
+
 async def migrate_organization_tables():
     """Add organization tables to the database."""
     try:
@@ -14,39 +22,23 @@ async def migrate_organization_tables():
         
         print("🔄 Starting migration for organization tables...")
         
-        await db.connect()
-        prisma = db.get_client()
-        
-        # Test if tables exist by trying to query them
-        try:
-            # Test RequirementCluster table
-            await prisma.requirementcluster.find_many(take=1)
-            print("✅ RequirementCluster table exists")
-        except Exception:
-            print("❌ RequirementCluster table missing - run: prisma migrate dev")
-        
-        try:
-            # Test LLMOrganizedRequirement table
-            await prisma.llmorganizedrequirement.find_many(take=1)
-            print("✅ LLMOrganizedRequirement table exists")
-        except Exception:
-            print("❌ LLMOrganizedRequirement table missing - run: prisma migrate dev")
-        
-        try:
-            # Test HarmonizedRequirement table
-            await prisma.harmonizedrequirement.find_many(take=1)
-            print("✅ HarmonizedRequirement table exists")
-        except Exception:
-            print("❌ HarmonizedRequirement table missing - run: prisma migrate dev")
-        
-        try:
-            # Test FinalComplianceRequirement table
-            await prisma.finalcompliancerequirement.find_many(take=1)
-            print("✅ FinalComplianceRequirement table exists")
-        except Exception:
-            print("❌ FinalComplianceRequirement table missing - run: prisma migrate dev")
+        async with db.session() as prisma:
+            # Check all tables in one catalog query instead of probing each table
+            rows = await prisma.query_raw(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_schema = 'public' AND table_name = ANY($1)",
+                list(ORGANIZATION_TABLES)
+            )
+            present = {row["table_name"] for row in rows}
+            missing = ORGANIZATION_TABLES.keys() - present
+            
+            for table_name, model_name in ORGANIZATION_TABLES.items():
+                status = "❌" if table_name in missing else "✅"
+                print(f"{status} {model_name} table {'missing' if table_name in missing else 'exists'}")
+            
+            if missing:
+                print(f"⚠️  {len(missing)} organization table(s) missing - run: prisma migrate dev")
         
-        await db.disconnect()
         print("✅ Migration check completed")
         
     except Exception as e:
@@ -6,7 +6,8 @@ This script will help migrate existing data and update the API endpoints.
 
 import asyncio
 import json
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta
 from typing import Dict, List
 from app.database import db
 from app.api.parser.models_v2 import (
@@ -14,6 +15,9 @@ from app.api.parser.models_v2 import (
     LegalEntityCreate, DeadlineCreate, PenaltyCreate
 )
 
+# Per-row messages are DEBUG; INFO only carries per-batch summaries
+log = logging.getLogger("migrator")
+
 class DatabaseMigrator:
     def __init__(self):
         self.migrated_documents = 0
@@ -21,161 +25,207 @@ class DatabaseMigrator:
         self.migrated_entities = 0
         self.migrated_deadlines = 0
         self.migrated_penalties = 0
+        self.transaction_timeout = timedelta(minutes=5)  # The whole migration runs in one transaction
     
     async def migrate_from_memory(self, documents_storage: Dict, rules_storage: Dict):
         """Migrate data from in-memory storage to database."""
-        print("🚀 Starting migration from in-memory storage to database...")
-        
-        # Connect to database
-        await db.connect()
-        prisma = db.get_client()
-        
-        try:
-            # Create a default user for migration
-            default_user = await prisma.user.create({
-                "email": "migration@sec-compliance.com",
-                "password": "migrated_user_password",
-                "fullName": "Migration User",
-                "role": "ADMIN"
-            })
-            print(f"✅ Created default user: {default_user.id}")
-            
-            # Migrate documents
-            await self._migrate_documents(prisma, documents_storage, default_user.id)
-            
-            # Migrate compliance requirements
-            await self._migrate_requirements(prisma, rules_storage)
-            
-            print(f"\n🎉 Migration completed successfully!")
-            print(f"   📄 Documents migrated: {self.migrated_documents}")
-            print(f"   📋 Requirements migrated: {self.migrated_requirements}")
-            print(f"   🏷️  Entities migrated: {self.migrated_entities}")
-            print(f"   ⏰ Deadlines migrated: {self.migrated_deadlines}")
-            print(f"   💰 Penalties migrated: {self.migrated_penalties}")
-            
-        except Exception as e:
-            print(f"❌ Migration failed: {str(e)}")
-            raise
-        finally:
-            await db.disconnect()
-    
-    async def _migrate_documents(self, prisma, documents_storage: Dict, user_id: str):
-        """Migrate documents from in-memory storage."""
-        print("📄 Migrating documents...")
+        log.info("🚀 Starting migration from in-memory storage to database...")
         
-        for doc_id, document in documents_storage.items():
+        # Connect to database for the duration of the migration
+        async with db.session() as prisma:
             try:
-                # Create document in database
-                db_document = await prisma.document.create({
-                    "id": document.id,
-                    "userId": user_id,
-                    "filename": document.filename,
-                    "originalFilename": document.filename,
-                    "fileSize": document.file_size,
-                    "documentType": document.document_type.value,
-                    "content": document.content,
-                    "uploadDate": document.upload_date,
-                    "processed": document.processed,
-                    "processingStatus": "COMPLETED" if document.processed else "PENDING"
-                })
+                # Everything commits together, so a failed run leaves nothing
+                # behind and a re-run only has to skip what a previous run finished
+                async with prisma.tx(timeout=self.transaction_timeout) as transaction:
+                    # Create the default migration user, or reuse it from an earlier run
+                    default_user = await transaction.user.upsert(
+                        where={"email": "migration@sec-compliance.com"},
+                        data={
+                            "create": {
+                                "email": "migration@sec-compliance.com",
+                                "password": "migrated_user_password",
+                                "fullName": "Migration User",
+                                "role": "ADMIN"
+                            },
+                            "update": {}
+                        }
+                    )
+                    log.info("✅ Using default user: %s", default_user.id)
+                    
+                    # Migrate documents
+                    await self._migrate_documents(transaction, documents_storage, default_user.id)
+                    
+                    # Migrate compliance requirements
+                    await self._migrate_requirements(transaction, rules_storage)
                 
-                self.migrated_documents += 1
-                print(f"   ✅ Migrated document: {document.filename}")
+                log.info(
+                    "\n🎉 Migration completed successfully!\n"
+                    "   📄 Documents migrated: %d\n"
+                    "   📋 Requirements migrated: %d\n"
+                    "   🏷️  Entities migrated: %d\n"
+                    "   ⏰ Deadlines migrated: %d\n"
+                    "   💰 Penalties migrated: %d",
+                    self.migrated_documents, self.migrated_requirements, self.migrated_entities,
+                    self.migrated_deadlines, self.migrated_penalties
+                )
                 
             except Exception as e:
-                print(f"   ❌ Failed to migrate document {document.filename}: {str(e)}")
+                log.error("❌ Migration failed: %s", e)
+                raise
+    
+    async def _migrate_documents(self, prisma, documents_storage: Dict, user_id: str):
+        """Migrate documents from in-memory storage."""
+        log.info("📄 Migrating documents...")
+        
+        document_rows = [
+            {
+                "id": document.id,
+                "userId": user_id,
+                "filename": document.filename,
+                "originalFilename": document.filename,
+                "fileSize": document.file_size,
+                "documentType": document.document_type.value,
+                "content": document.content,
+                "uploadDate": document.upload_date,
+                "processed": document.processed,
+                "processingStatus": "COMPLETED" if document.processed else "PENDING"
+            }
+            for document in documents_storage.values()
+        ]
+        
+        # Skip documents that were already migrated
+        existing_ids = await self._existing_ids(prisma.document, document_rows)
+        document_rows = [row for row in document_rows if row["id"] not in existing_ids]
+        if existing_ids:
+            log.info("   ⏭️  %d documents already migrated, skipping", len(existing_ids))
+        
+        if document_rows:
+            self.migrated_documents += await prisma.document.create_many(data=document_rows)
+        
+        for row in document_rows:
+            log.debug("   ✅ Migrated document: %s", row["filename"])
+        log.info("   📄 %d documents migrated", self.migrated_documents)
     
     async def _migrate_requirements(self, prisma, rules_storage: Dict):
         """Migrate compliance requirements from in-memory storage."""
-        print("📋 Migrating compliance requirements...")
+        log.info("📋 Migrating compliance requirements...")
+        
+        requirement_rows = []
+        entity_rows = []
+        deadline_rows = []
+        penalty_rows = []
+        
+        # Load document ids once instead of querying per rule
+        documents = await prisma.document.find_many()
+        document_id_by_filename = {document.filename: document.id for document in documents}
         
+        # Resolve foreign keys and build every row in Python first
         for rule_id, rule in rules_storage.items():
-            try:
-                # Find the document for this rule
-                document = await prisma.document.find_first(
-                    where={"filename": rule.source_document}
-                )
-                
-                if not document:
-                    print(f"   ⚠️  Document not found for rule: {rule.title}")
-                    continue
-                
-                # Create compliance requirement
-                db_requirement = await prisma.compliancerequirement.create({
-                    "id": rule.rule_id,
-                    "documentId": document.id,
-                    "title": rule.title,
-                    "description": rule.description,
-                    "requirementType": rule.rule_type.value,
-                    "confidenceScore": rule.confidence_score,
-                    "bertConfidence": getattr(rule, 'bert_confidence', None),
-                    "extractionMethod": getattr(rule, 'extraction_method', 'hybrid'),
-                    "sourceText": rule.source_text
-                })
-                
-                self.migrated_requirements += 1
-                print(f"   ✅ Migrated requirement: {rule.title[:50]}...")
-                
-                # Migrate legal entities if they exist
-                if hasattr(rule, 'legal_entities') and rule.legal_entities:
-                    await self._migrate_entities(prisma, rule.legal_entities, rule.rule_id)
-                
-                # Migrate deadlines if they exist
-                if hasattr(rule, 'deadlines') and rule.deadlines:
-                    await self._migrate_deadlines(prisma, rule.deadlines, rule.rule_id)
-                
-                # Migrate penalties if they exist
-                if hasattr(rule, 'penalties') and rule.penalties:
-                    await self._migrate_penalties(prisma, rule.penalties, rule.rule_id)
-                
-            except Exception as e:
-                print(f"   ❌ Failed to migrate requirement {rule.title}: {str(e)}")
+            document_id = document_id_by_filename.get(rule.source_document)
+            
+            if not document_id:
+                log.warning("   ⚠️  Document not found for rule: %s", rule.title)
+                continue
+            
+            requirement_rows.append({
+                "id": rule.rule_id,
+                "documentId": document_id,
+                "title": rule.title,
+                "description": rule.description,
+                "requirementType": rule.rule_type.value,
+                "confidenceScore": rule.confidence_score,
+                "bertConfidence": getattr(rule, 'bert_confidence', None),
+                "extractionMethod": getattr(rule, 'extraction_method', 'hybrid'),
+                "sourceText": rule.source_text
+            })
+            
+            # Collect legal entities if they exist
+            if hasattr(rule, 'legal_entities') and rule.legal_entities:
+                entity_rows.extend(self._entity_rows(rule.legal_entities, rule.rule_id))
+            
+            # Collect deadlines if they exist
+            if hasattr(rule, 'deadlines') and rule.deadlines:
+                deadline_rows.extend(self._deadline_rows(rule.deadlines, rule.rule_id))
+            
+            # Collect penalties if they exist
+            if hasattr(rule, 'penalties') and rule.penalties:
+                penalty_rows.extend(self._penalty_rows(rule.penalties, rule.rule_id))
+        
+        # Skip requirements that were already migrated, along with their
+        # entities, deadlines and penalties, so re-runs don't duplicate them
+        existing_ids = await self._existing_ids(prisma.compliancerequirement, requirement_rows)
+        if existing_ids:
+            log.info("   ⏭️  %d requirements already migrated, skipping", len(existing_ids))
+            requirement_rows = [row for row in requirement_rows if row["id"] not in existing_ids]
+            entity_rows = [row for row in entity_rows if row["requirementId"] not in existing_ids]
+            deadline_rows = [row for row in deadline_rows if row["requirementId"] not in existing_ids]
+            penalty_rows = [row for row in penalty_rows if row["requirementId"] not in existing_ids]
+        
+        # One multi-row INSERT per table, inside the caller's transaction
+        if requirement_rows:
+            self.migrated_requirements += await prisma.compliancerequirement.create_many(data=requirement_rows)
+        if entity_rows:
+            self.migrated_entities += await prisma.legalentity.create_many(data=entity_rows)
+        if deadline_rows:
+            self.migrated_deadlines += await prisma.deadline.create_many(data=deadline_rows)
+        if penalty_rows:
+            self.migrated_penalties += await prisma.penalty.create_many(data=penalty_rows)
+        
+        for row in requirement_rows:
+            log.debug("   ✅ Migrated requirement: %s...", row["title"][:50])
+        
+        log.info(
+            "   📋 %d requirements, %d entities, %d deadlines, %d penalties migrated",
+            self.migrated_requirements, self.migrated_entities,
+            self.migrated_deadlines, self.migrated_penalties
+        )
     
-    async def _migrate_entities(self, prisma, entities: List, requirement_id: str):
-        """Migrate legal entities."""
-        for entity in entities:
-            try:
-                await prisma.legalentity.create({
-                    "requirementId": requirement_id,
-                    "text": entity.text,
-                    "label": entity.label.value,
-                    "confidence": entity.confidence,
-                    "startPos": entity.start_pos,
-                    "endPos": entity.end_pos
-                })
-                self.migrated_entities += 1
-            except Exception as e:
-                print(f"   ❌ Failed to migrate entity: {str(e)}")
+    async def _existing_ids(self, table, rows: List[Dict]) -> set:
+        """Return the ids from rows that already exist in the given table."""
+        if not rows:
+            return set()
+        existing = await table.find_many(where={"id": {"in": [row["id"] for row in rows]}})
+        return {record.id for record in existing}
     
-    async def _migrate_deadlines(self, prisma, deadlines: List, requirement_id: str):
-        """Migrate deadlines."""
-        for deadline in deadlines:
-            try:
-                await prisma.deadline.create({
-                    "requirementId": requirement_id,
-                    "description": deadline.description,
-                    "dueDate": deadline.due_date,
-                    "frequency": deadline.frequency,
-                    "isRecurring": deadline.is_recurring
-                })
-                self.migrated_deadlines += 1
-            except Exception as e:
-                print(f"   ❌ Failed to migrate deadline: {str(e)}")
+    def _entity_rows(self, entities: List, requirement_id: str) -> List[Dict]:
+        """Build legal entity rows."""
+        return [
+            {
+                "requirementId": requirement_id,
+                "text": entity.text,
+                "label": entity.label.value,
+                "confidence": entity.confidence,
+                "startPos": entity.start_pos,
+                "endPos": entity.end_pos
+            }
+            for entity in entities
+        ]
     
-    async def _migrate_penalties(self, prisma, penalties: List, requirement_id: str):
-        """Migrate penalties."""
-        for penalty in penalties:
-            try:
-                await prisma.penalty.create({
-                    "requirementId": requirement_id,
-                    "description": penalty.description,
-                    "amount": penalty.amount,
-                    "currency": penalty.currency,
-                    "penaltyType": penalty.penalty_type.value
-                })
-                self.migrated_penalties += 1
-            except Exception as e:
-                print(f"   ❌ Failed to migrate penalty: {str(e)}")
+    def _deadline_rows(self, deadlines: List, requirement_id: str) -> List[Dict]:
+        """Build deadline rows."""
+        return [
+            {
+                "requirementId": requirement_id,
+                "description": deadline.description,
+                "dueDate": deadline.due_date,
+                "frequency": deadline.frequency,
+                "isRecurring": deadline.is_recurring
+            }
+            for deadline in deadlines
+        ]
+    
+    def _penalty_rows(self, penalties: List, requirement_id: str) -> List[Dict]:
+        """Build penalty rows."""
+        return [
+            {
+                "requirementId": requirement_id,
+                "description": penalty.description,
+                "amount": penalty.amount,
+                "currency": penalty.currency,
+                "penaltyType": penalty.penalty_type.value
+            }
+            for penalty in penalties
+        ]
 
 async def main():
     """Main migration function."""
@@ -201,4 +251,5 @@ async def main():
     print("4. Deploy to production")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     asyncio.run(main())
@@ -6,6 +6,7 @@ This bypasses the shadow database requirement.
 
 import asyncio
 import os
+from datetime import timedelta
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -16,12 +17,6 @@ async def setup_database():
     try:
         from app.database import db
         
-        print("🔗 Connecting to database...")
-        await db.connect()
-        prisma = db.get_client()
-        
-        print("📋 Creating database tables...")
-        
         # Create tables in the correct order (respecting foreign key constraints)
         tables_sql = [
             # Users table
@@ -147,15 +142,7 @@ async def setup_database():
             """
         ]
         
-        # Execute each table creation
-        for i, sql in enumerate(tables_sql, 1):
-            print(f"   📋 Creating table {i}/{len(tables_sql)}...")
-            await prisma.query_raw(sql)
-        
-        print("✅ All tables created successfully!")
-        
         # Create indexes for better performance
-        print("🔍 Creating indexes...")
         indexes_sql = [
             "CREATE INDEX IF NOT EXISTS idx_documents_user_id ON documents(\"userId\");",
             "CREATE INDEX IF NOT EXISTS idx_compliance_requirements_document_id ON compliance_requirements(\"documentId\");",
@@ -166,17 +153,30 @@ async def setup_database():
             "CREATE INDEX IF NOT EXISTS idx_reports_user_id ON reports(\"userId\");"
         ]
         
-        for sql in indexes_sql:
-            await prisma.query_raw(sql)
-        
-        print("✅ All indexes created successfully!")
-        
-        # Test the setup
-        print("🧪 Testing database setup...")
-        result = await prisma.query_raw("SELECT COUNT(*) as table_count FROM information_schema.tables WHERE table_schema = 'public';")
-        print(f"✅ Database setup complete! Found {result[0]['table_count']} tables.")
+        print("🔗 Connecting to database...")
+        async with db.session() as prisma:
+            print("📋 Creating database tables...")
+            
+            # Run all DDL in one transaction so the schema is created atomically.
+            # Postgres rejects multiple commands in one prepared statement, so each
+            # statement is still sent separately over the transaction's connection.
+            # Allow longer than the default 5s so slow or remote databases don't roll back
+            async with prisma.tx(timeout=timedelta(minutes=1)) as transaction:
+                for i, sql in enumerate(tables_sql, 1):
+                    print(f"   📋 Creating table {i}/{len(tables_sql)}...")
+                    await transaction.execute_raw(sql)
+                
+                print("🔍 Creating indexes...")
+                for sql in indexes_sql:
+                    await transaction.execute_raw(sql)
+            
+            print("✅ All tables and indexes created successfully!")
+            
+            # Test the setup
+            print("🧪 Testing database setup...")
+            result = await prisma.query_raw("SELECT COUNT(*) as table_count FROM information_schema.tables WHERE table_schema = 'public';")
+            print(f"✅ Database setup complete! Found {result[0]['table_count']} tables.")
         
-        await db.disconnect()
         print("🎉 Database setup completed successfully!")
         
     except Exception as e:
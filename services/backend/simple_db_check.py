@@ -18,34 +18,34 @@ def main():
         
         async def check_data():
             try:
-                await db.connect()
-                prisma = db.get_client()
+                async with db.session() as prisma:
+                    # Count documents, requirements and users in one round-trip
+                    counts = (await prisma.query_raw(
+                        "SELECT "
+                        "(SELECT count(*) FROM documents)::int AS documents, "
+                        "(SELECT count(*) FROM compliance_requirements)::int AS requirements, "
+                        "(SELECT count(*) FROM users)::int AS users"
+                    ))[0]
+                    doc_count = counts["documents"]
+                    req_count = counts["requirements"]
+                    user_count = counts["users"]
+                    
+                    print(f"Documents in database: {doc_count}")
+                    print(f"Compliance requirements in database: {req_count}")
+                    print(f"Users in database: {user_count}")
+                    
+                    if doc_count > 0:
+                        print("\nSample documents:")
+                        docs = await prisma.document.find_many(take=3)
+                        for doc in docs:
+                            print(f"   - {doc.filename} (ID: {doc.id})")
+                    
+                    if req_count > 0:
+                        print("\nSample requirements:")
+                        reqs = await prisma.compliancerequirement.find_many(take=3)
+                        for req in reqs:
+                            print(f"   - {req.title} (ID: {req.id})")
                 
-                # Check documents
-                doc_count = await prisma.document.count()
-                print(f"Documents in database: {doc_count}")
-                
-                # Check requirements
-                req_count = await prisma.compliancerequirement.count()
-                print(f"Compliance requirements in database: {req_count}")
-                
-                # Check users
-                user_count = await prisma.user.count()
-                print(f"Users in database: {user_count}")
-                
-                if doc_count > 0:
-                    print("\nSample documents:")
-                    docs = await prisma.document.find_many(take=3)
-                    for doc in docs:
-                        print(f"   - {doc.filename} (ID: {doc.id})")
-                
-                if req_count > 0:
-                    print("\nSample requirements:")
-                    reqs = await prisma.compliancerequirement.find_many(take=3)
-                    for req in reqs:
-                        print(f"   - {req.title} (ID: {req.id})")
-                
-                await db.disconnect()
                 return doc_count, req_count
                 
             except Exception as e:
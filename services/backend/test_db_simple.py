@@ -5,8 +5,11 @@ Simple database connection test
 
 import sys
 import os
+import asyncio
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
+from _env_utils import load_env, missing_pool_settings, RECOMMENDED_POOL_PARAMS
+
 async def test_db_connection():
     """Test database connection."""
     try:
@@ -14,18 +17,21 @@ async def test_db_connection():
         
         print("Testing database connection...")
         
-        await db.connect()
-        prisma = db.get_client()
-        
-        # Test simple query
-        user_count = await prisma.user.count()
-        print(f"Database connected - Users: {user_count}")
+        # The counts below run concurrently, so a one-slot pool would serialize them
+        database_url = os.environ.get("DATABASE_URL") or load_env().get("DATABASE_URL", "")
+        if missing_pool_settings(database_url):
+            print(f"Warning: DATABASE_URL has no connection_limit; consider appending ?{RECOMMENDED_POOL_PARAMS}")
         
-        # Test LLM table
-        llm_count = await prisma.llmorganizedrequirement.count()
-        print(f"LLM organized requirements: {llm_count}")
+        # Reuses an already-connected client if the caller opened one
+        async with db.session() as prisma:
+            # Run both counts concurrently
+            user_count, llm_count = await asyncio.gather(
+                prisma.user.count(),
+                prisma.llmorganizedrequirement.count()
+            )
+            print(f"Database connected - Users: {user_count}")
+            print(f"LLM organized requirements: {llm_count}")
         
-        await db.disconnect()
         print("Database connection successful")
         return True
         
@@ -35,7 +41,6 @@ async def test_db_connection():
 
 def main():
     """Run database test."""
-    import asyncio
     asyncio.run(test_db_connection())
 
 if __name__ == "__main__":